@@ -1,22 +1,22 @@
 """
 AI Resume Analyzer - FastAPI Backend
 """
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, Query, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
+from io import BytesIO
+import asyncio
 import hashlib
+import json
 import os
+import diskcache
 from dotenv import load_dotenv
 
-from utils import (
-    extract_text_from_pdf,
-    split_into_sections,
-    extract_skills,
-    estimate_years_of_experience,
-    calculate_score
-)
-from openai_client import call_openai_suggestions
+from utils import extract_text_from_pdf, analyze, SPACY_SKILL_MATCHING
+from openai_client import call_openai_suggestions, call_openai_suggestions_stream, fallback_suggestions, CACHE_DIR
+from openai_batch import submit_batch, get_batch_results
 
 # Load environment variables
 load_dotenv()
@@ -38,10 +38,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Stop PDF extraction after this many characters. Well above the length
+# where the format score already bottoms out, so only very long CVs are cut
+MAX_RESUME_CHARS = int(os.getenv("MAX_RESUME_CHARS", "20000"))
+
+# Limit local analyses running in worker threads across all requests. PDF
+# parsing is serialized on PDFIUM_LOCK, so extra threads would only queue
+MAX_ANALYSIS_WORKERS = int(os.getenv("MAX_ANALYSIS_WORKERS", "8"))
+analysis_semaphore = asyncio.Semaphore(MAX_ANALYSIS_WORKERS)
+
 # In-memory cache for analysis results (optional feature)
 # Key: file content hash, Value: analysis result
 analysis_cache: Dict[str, dict] = {}
 
+# Pending Batch API jobs, kept on disk so they survive restarts while the
+# batch runs (up to 24h). Entries are dropped once results are served or the
+# batch fails.
+# Key: OpenAI batch id, Value: list of local analyses awaiting suggestions
+BATCH_JOB_EXPIRE_SECONDS = 7 * 86400
+batch_jobs = diskcache.Cache(os.path.join(CACHE_DIR, "batch_jobs"))
+
 
 # Response models
 class AnalysisBreakdown(BaseModel):
@@ -68,6 +84,125 @@ class AnalysisResponse(BaseModel):
     raw_text_preview: str
 
 
+def run_local_analysis(file_content: bytes, job_title: str = "") -> dict:
+    """
+    Run every analysis step that does not need OpenAI: text extraction,
+    section splitting, skills, experience and scoring.
+    
+    Raises:
+        HTTPException: If no text can be extracted from the PDF
+    """
+    # Extract text from PDF
+    try:
+        # Create a temporary file-like object
+        pdf_file = BytesIO(file_content)
+        text = extract_text_from_pdf(pdf_file, max_chars=MAX_RESUME_CHARS)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+    
+    if not text.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="The PDF appears to be empty or contains no extractable text. Please ensure the PDF contains readable text."
+        )
+    
+    # Sections, skills, experience and score
+    analysis = analyze(text, job_title)
+    
+    return {
+        "text": text,
+        "score": analysis["score"],
+        "breakdown": analysis["breakdown"],
+        "skills": analysis["skills"],
+        "years_experience": analysis["years_experience"]
+    }
+
+
+async def run_local_analysis_in_thread(file_content: bytes, job_title: str = "") -> dict:
+    """Run run_local_analysis in a worker thread so it never blocks the event loop."""
+    async with analysis_semaphore:
+        return await asyncio.to_thread(run_local_analysis, file_content, job_title)
+
+
+async def analyze_batch(
+    uploads: List[Tuple[str, bytes]],
+    job_title: str = "",
+    with_suggestions: bool = True
+) -> List[dict]:
+    """
+    Analyze several uploaded PDFs concurrently.
+    
+    Local analysis runs in worker threads so it never blocks the event loop.
+    It does not parallelize much: PDFium calls are serialized by PDFIUM_LOCK
+    and the automaton and regex scans hold the GIL. The gain is that each
+    resume's OpenAI call starts as soon as its own local analysis finishes,
+    so parsing of later files overlaps with network waits for earlier ones.
+    
+    Args:
+        uploads: (filename, file content) pairs
+        job_title: Optional target job title
+        with_suggestions: Also request AI suggestions for each resume
+        
+    Returns:
+        One entry per upload, in order: either the local analysis (plus
+        suggestions) or a dict with filename and error
+    """
+    async def analyze_upload(filename: str, content: bytes) -> dict:
+        if not filename.lower().endswith('.pdf'):
+            return {"filename": filename, "error": "Only PDF files are accepted."}
+        
+        # One bad file must not fail the whole batch
+        try:
+            analysis = await run_local_analysis_in_thread(content, job_title)
+        except HTTPException as e:
+            return {"filename": filename, "error": e.detail}
+        except Exception as e:
+            return {"filename": filename, "error": f"Error processing resume: {str(e)}"}
+        
+        entry = {"filename": filename, "job_title": job_title, **analysis}
+        if with_suggestions:
+            entry["suggestions"] = await call_openai_suggestions(**_suggestion_request(entry))
+        return entry
+    
+    return await asyncio.gather(*[
+        analyze_upload(filename, content) for filename, content in uploads
+    ])
+
+
+def _suggestion_request(analysis: dict) -> dict:
+    """Build call_openai_suggestions arguments from a batch entry."""
+    return {
+        "resume_text": analysis["text"],
+        "score": analysis["score"],
+        "skills": analysis["skills"],
+        "years_exp": analysis["years_experience"],
+        "job_title": analysis["job_title"]
+    }
+
+
+def _batch_result(analysis: dict) -> dict:
+    """Shape a batch entry like a single /analyze response."""
+    if "error" in analysis:
+        return analysis
+    return {
+        "filename": analysis["filename"],
+        "score": analysis["score"],
+        "breakdown": analysis["breakdown"],
+        "skills": analysis["skills"],
+        "years_experience": analysis["years_experience"],
+        "suggestions": analysis["suggestions"],
+        "raw_text_preview": analysis["text"][:1000]
+    }
+
+
+def _sse_event(event: str, data) -> str:
+    """Format a Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -115,45 +250,16 @@ async def analyze_resume(
             cached_result = analysis_cache[content_hash]
             return {**cached_result, "cached": True}
         
-        # Extract text from PDF
-        try:
-            # Create a temporary file-like object
-            from io import BytesIO
-            pdf_file = BytesIO(file_content)
-            text = extract_text_from_pdf(pdf_file)
-        except ValueError as e:
-            raise HTTPException(
-                status_code=400,
-                detail=str(e)
-            )
-        
-        if not text.strip():
-            raise HTTPException(
-                status_code=400,
-                detail="The PDF appears to be empty or contains no extractable text. Please ensure the PDF contains readable text."
-            )
-        
-        # Split into sections
-        sections = split_into_sections(text)
-        
-        # Extract skills
-        skills = extract_skills(text, sections)
-        
-        # Estimate years of experience
-        years_exp = estimate_years_of_experience(text, sections)
-        
-        # Calculate score
-        score, breakdown = calculate_score(
-            text=text,
-            sections=sections,
-            skills=skills,
-            years_exp=years_exp,
-            job_title=job_title or ""
-        )
+        analysis = await run_local_analysis_in_thread(file_content, job_title or "")
+        text = analysis["text"]
+        score = analysis["score"]
+        breakdown = analysis["breakdown"]
+        skills = analysis["skills"]
+        years_exp = analysis["years_experience"]
         
         # Get AI-powered suggestions
         try:
-            suggestions = call_openai_suggestions(
+            suggestions = await call_openai_suggestions(
                 resume_text=text,
                 score=score,
                 skills=skills,
@@ -204,23 +310,173 @@ async def analyze_resume(
         )
 
 
+@app.post("/analyze/stream")
+async def analyze_resume_stream(
+    file: UploadFile = File(..., description="PDF resume file to analyze"),
+    job_title: Optional[str] = Form(None, description="Target job title (optional)")
+):
+    """
+    Analyze a resume PDF and stream the result as Server-Sent Events.
+    
+    Events:
+    - analysis: score, breakdown, skills, years_experience and raw_text_preview
+    - token: a piece of the AI response as it is generated
+    - suggestions: the final parsed suggestions
+    """
+    if not file.filename.lower().endswith('.pdf'):
+        raise HTTPException(
+            status_code=400,
+            detail="Only PDF files are accepted. Please upload a .pdf file."
+        )
+    
+    file_content = await file.read()
+    content_hash = hashlib.md5(file_content).hexdigest()
+    cached_result = analysis_cache.get(content_hash)
+    
+    if cached_result is None:
+        analysis = await run_local_analysis_in_thread(file_content, job_title or "")
+        analysis["job_title"] = job_title or ""
+    
+    async def event_stream():
+        if cached_result is not None:
+            yield _sse_event("analysis", {k: v for k, v in cached_result.items() if k != "suggestions"})
+            yield _sse_event("suggestions", cached_result["suggestions"])
+            return
+        
+        result = {
+            "score": analysis["score"],
+            "breakdown": analysis["breakdown"],
+            "skills": analysis["skills"],
+            "years_experience": analysis["years_experience"],
+            "raw_text_preview": analysis["text"][:1000]
+        }
+        yield _sse_event("analysis", result)
+        
+        async for event in call_openai_suggestions_stream(**_suggestion_request(analysis)):
+            if event["type"] == "token":
+                yield _sse_event("token", {"content": event["content"]})
+            else:
+                result["suggestions"] = event["suggestions"]
+                analysis_cache[content_hash] = result
+                yield _sse_event("suggestions", event["suggestions"])
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@app.post("/analyze/batch")
+async def analyze_resume_batch(
+    files: List[UploadFile] = File(..., description="PDF resume files to analyze"),
+    job_title: Optional[str] = Form(None, description="Target job title (optional)"),
+    mode: str = Query("interactive", description="'interactive' to wait for suggestions, 'batch' to use the OpenAI Batch API")
+):
+    """
+    Analyze several resume PDFs at once.
+    
+    In interactive mode suggestions for all resumes are requested concurrently
+    and returned directly. In batch mode the suggestion requests are submitted
+    to the OpenAI Batch API (cheaper, completes within 24h) and a batch_id is
+    returned; poll GET /analyze/batch/{batch_id} for the results.
+    """
+    if mode not in ("interactive", "batch"):
+        raise HTTPException(
+            status_code=400,
+            detail="mode must be either 'interactive' or 'batch'."
+        )
+    
+    uploads = [(file.filename, await file.read()) for file in files]
+    results = await analyze_batch(uploads, job_title or "", with_suggestions=(mode == "interactive"))
+    
+    analyzed = [r for r in results if "error" not in r]
+    
+    if mode == "batch":
+        if not analyzed:
+            raise HTTPException(
+                status_code=400,
+                detail="None of the uploaded files could be analyzed."
+            )
+        try:
+            batch_id = await submit_batch([_suggestion_request(r) for r in analyzed])
+        except Exception as e:
+            raise HTTPException(
+                status_code=502,
+                detail=f"Failed to submit OpenAI batch: {str(e)}"
+            )
+        
+        batch_jobs.set(batch_id, analyzed, expire=BATCH_JOB_EXPIRE_SECONDS)
+        return {
+            "batch_id": batch_id,
+            "status": "submitted",
+            "errors": [r for r in results if "error" in r]
+        }
+    
+    return {"results": [_batch_result(r) for r in results]}
+
+
+@app.get("/analyze/batch/{batch_id}")
+async def get_batch_analysis(batch_id: str):
+    """
+    Check an OpenAI Batch API job submitted via POST /analyze/batch?mode=batch.
+    Returns the per-resume analyses once the batch has completed.
+    """
+    analyzed = batch_jobs.get(batch_id)
+    if analyzed is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Unknown batch id."
+        )
+    
+    try:
+        batch = await get_batch_results(batch_id, [_suggestion_request(r) for r in analyzed])
+    except RuntimeError as e:
+        batch_jobs.pop(batch_id, None)
+        raise HTTPException(
+            status_code=502,
+            detail=str(e)
+        )
+    except Exception as e:
+        # Transient SDK/network error: keep the job so it can be polled again
+        raise HTTPException(
+            status_code=502,
+            detail=f"Failed to check OpenAI batch: {str(e)}"
+        )
+    
+    if batch["results"] is None:
+        return {"batch_id": batch_id, "status": batch["status"]}
+    
+    for i, r in enumerate(analyzed):
+        r["suggestions"] = batch["results"].get(str(i)) or fallback_suggestions(
+            r["years_experience"], r["job_title"], "missing from batch output"
+        )
+    batch_jobs.pop(batch_id, None)
+    
+    return {
+        "batch_id": batch_id,
+        "status": batch["status"],
+        "results": [_batch_result(r) for r in analyzed]
+    }
+
+
 @app.get("/health")
 async def health_check():
     """Detailed health check"""
-    import spacy
-    
     checks = {
         "api": "healthy",
         "spacy_model": "not loaded",
         "openai_key": "not configured"
     }
     
-    # Check spaCy
+    # Check spaCy without loading the model; it is only needed (and loaded on
+    # first use) when SPACY_SKILL_MATCHING is on
     try:
-        nlp = spacy.load("en_core_web_sm")
-        checks["spacy_model"] = "loaded"
-    except:
-        checks["spacy_model"] = "missing - run: python -m spacy download en_core_web_sm"
+        import spacy
+        if not spacy.util.is_package("en_core_web_sm"):
+            checks["spacy_model"] = "missing - run: python -m spacy download en_core_web_sm"
+        elif SPACY_SKILL_MATCHING:
+            checks["spacy_model"] = "enabled"
+        else:
+            checks["spacy_model"] = "installed"
+    except ImportError:
+        checks["spacy_model"] = "missing - run: pip install spacy"
     
     # Check OpenAI key
     if os.getenv("OPENAI_API_KEY"):
@@ -236,6 +492,7 @@ async def get_stats():
     """Get API statistics"""
     return {
         "cached_analyses": len(analysis_cache),
+        "pending_batches": len(batch_jobs),
         "cache_size_kb": sum(
             len(str(v)) for v in analysis_cache.values()
         ) / 1024
@@ -0,0 +1,219 @@
+"""
+OpenAI Batch API support for non-interactive bulk resume analysis.
+
+Batch jobs are billed at a discount and complete asynchronously (within 24h),
+so this path is meant for offline bulk uploads rather than interactive use.
+"""
+import asyncio
+import json
+import time
+from typing import Dict, List, Optional
+
+from openai_client import (
+    client as suggestions_client,
+    OPENAI_MODEL,
+    COMPLETION_PARAMS,
+    build_messages,
+    parse_suggestions,
+    unparsed_suggestions,
+    fallback_suggestions,
+    suggestions_cache_key,
+    store_cached_suggestions
+)
+
+# The shared client has retries disabled (suggestions use their own retry
+# policy); keep the SDK's default retries for file and batch management calls
+client = suggestions_client.with_options(max_retries=2)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+
+# Batch statuses that will not change any more
+FAILED_BATCH_STATUSES = {"failed", "expired", "cancelled"}
+
+
+def _batch_request_line(custom_id: str, item: Dict) -> str:
+    """Serialize one resume into a Batch API JSONL request line."""
+    body = {
+        "model": OPENAI_MODEL,
+        "messages": build_messages(
+            resume_text=item["resume_text"],
+            score=item["score"],
+            skills=item["skills"],
+            years_exp=item["years_exp"],
+            job_title=item.get("job_title", "")
+        ),
+        **COMPLETION_PARAMS
+    }
+    return json.dumps({
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": BATCH_ENDPOINT,
+        "body": body
+    })
+
+
+async def submit_batch(items: List[Dict]) -> str:
+    """
+    Upload suggestion requests for several resumes and create a batch job.
+
+    Args:
+        items: Dicts with keys resume_text, score, skills, years_exp and
+            optionally job_title. The list index is used as the custom_id.
+
+    Returns:
+        The OpenAI batch id
+    """
+    jsonl = "\n".join(_batch_request_line(str(i), item) for i, item in enumerate(items))
+
+    input_file = await client.files.create(
+        file=("resume_batch.jsonl", jsonl.encode("utf-8")),
+        purpose="batch"
+    )
+    batch = await client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=BATCH_COMPLETION_WINDOW
+    )
+    return batch.id
+
+
+def _parse_batch_output(output: str, items: Optional[List[Dict]] = None) -> Dict[str, Dict]:
+    """
+    Map each custom_id in a batch output file to its suggestions.
+
+    When the original items are given, well-formed results are also stored in
+    the suggestions cache so later interactive requests can reuse them.
+    """
+    results = {}
+
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            custom_id = record["custom_id"]
+            item = items[int(custom_id)] if items else {}
+        except (ValueError, KeyError, IndexError, TypeError):
+            # Without a usable custom_id the record can't be matched to a
+            # resume; callers fill in fallbacks for missing entries
+            continue
+
+        # Malformed records must not fail the whole batch, or every later poll
+        # would re-parse the same output and fail the same way
+        try:
+            response = record.get("response") or {}
+            if record.get("error") or response.get("status_code") != 200:
+                error = record.get("error") or response.get("body", {}).get("error")
+                results[custom_id] = fallback_suggestions(
+                    item.get("years_exp", 0), item.get("job_title", ""), str(error)
+                )
+                continue
+
+            content = (response["body"]["choices"][0]["message"]["content"] or "").strip()
+            suggestions_data = parse_suggestions(content)
+        except json.JSONDecodeError:
+            results[custom_id] = unparsed_suggestions(content)
+            continue
+        except Exception as e:
+            results[custom_id] = fallback_suggestions(
+                item.get("years_exp", 0), item.get("job_title", ""), str(e)
+            )
+            continue
+
+        if item:
+            cache_key = suggestions_cache_key(
+                item["resume_text"], item["score"], item["skills"],
+                item["years_exp"], item.get("job_title", "")
+            )
+            store_cached_suggestions(cache_key, suggestions_data)
+        results[custom_id] = suggestions_data
+
+    return results
+
+
+async def get_batch_results(batch_id: str, items: Optional[List[Dict]] = None) -> Dict:
+    """
+    Check a batch job once without waiting.
+
+    Results from the output and error files are merged; resumes missing from
+    both get no entry, so callers should fill in fallback suggestions.
+
+    Returns:
+        Dictionary with keys: status (str) and results (custom_id -> suggestions
+        dict, or None while the batch is still running)
+
+    Raises:
+        RuntimeError: If the batch failed, expired or was cancelled
+    """
+    batch = await client.batches.retrieve(batch_id)
+
+    if batch.status in FAILED_BATCH_STATUSES:
+        raise RuntimeError(f"Batch {batch_id} ended with status '{batch.status}'")
+    if batch.status != "completed":
+        return {"status": batch.status, "results": None}
+
+    # Successful requests are written to the output file and failed ones to the
+    # error file; either can be missing (e.g. no output when every request failed)
+    results = {}
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if file_id is None:
+            continue
+        output = await client.files.content(file_id)
+        results.update(_parse_batch_output(output.text, items))
+
+    return {"status": batch.status, "results": results}
+
+
+async def await_batch(
+    batch_id: str,
+    items: Optional[List[Dict]] = None,
+    initial_delay: float = 5.0,
+    max_delay: float = 300.0,
+    timeout: Optional[float] = None
+) -> Dict[str, Dict]:
+    """
+    Poll a batch job with exponential backoff until it completes.
+
+    Returns:
+        Dictionary mapping custom_id to suggestions
+
+    Raises:
+        RuntimeError: If the batch failed, expired or was cancelled
+        TimeoutError: If the batch did not complete within timeout seconds
+    """
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    delay = initial_delay
+
+    while True:
+        batch = await get_batch_results(batch_id, items)
+        if batch["results"] is not None:
+            return batch["results"]
+
+        if deadline is not None and time.monotonic() + delay > deadline:
+            raise TimeoutError(f"Batch {batch_id} still '{batch['status']}' after {timeout}s")
+
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_delay)
+
+
+async def call_openai_suggestions_batch(resumes: List[Dict], **poll_kwargs) -> List[Dict]:
+    """
+    Generate suggestions for many resumes through the Batch API.
+
+    Intended for offline scripts; this can take up to the 24h completion window.
+
+    Args:
+        resumes: Dicts with the call_openai_suggestions arguments
+
+    Returns:
+        Suggestions dicts in the same order as resumes
+    """
+    batch_id = await submit_batch(resumes)
+    results = await await_batch(batch_id, resumes, **poll_kwargs)
+    return [
+        results.get(str(i)) or fallback_suggestions(
+            resume["years_exp"], resume.get("job_title", ""), "missing from batch output"
+        )
+        for i, resume in enumerate(resumes)
+    ]
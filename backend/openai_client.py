@@ -3,54 +3,68 @@ OpenAI API client for generating resume improvement suggestions
 """
 import os
 import json
-from typing import Dict, List
-from openai import OpenAI
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, List, Optional
+import diskcache
+import httpx
+from openai import AsyncOpenAI, APIConnectionError, APITimeoutError, RateLimitError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Shared HTTP client: keep-alive connection pool + HTTP/2 so repeated and
+# concurrent completions reuse sockets instead of paying a TLS handshake each
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60),
+    timeout=httpx.Timeout(30.0, connect=5.0),
+    http2=True
+)
 
+# Initialize OpenAI client. Its built-in retries are disabled so that
+# create_completion's retry policy is the only one
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=http_client, max_retries=0)
 
-def call_openai_suggestions(
-    resume_text: str,
-    score: float,
-    skills: List[str],
-    years_exp: int,
-    job_title: str = ""
-) -> Dict:
-    """
-    Call OpenAI API to generate resume improvement suggestions.
-    
-    Args:
-        resume_text: Full text of the resume
-        score: Calculated resume score
-        skills: List of detected skills
-        years_exp: Estimated years of experience
-        job_title: Optional target job title
-        
-    Returns:
-        Dictionary with keys: suggestions (list), rewritten_bullet (str),
-        title (str), ats_keywords (list)
-    """
-    # Truncate resume text if too long (to manage token costs)
-    max_chars = 3000
-    if len(resume_text) > max_chars:
-        resume_text = resume_text[:max_chars] + "...[truncated]"
-    
-    # Build the prompt
-    job_context = f" for a '{job_title}' position" if job_title else ""
-    
-    prompt = f"""You are an expert resume reviewer and career coach. Analyze the following resume{job_context}.
+# Per-attempt timeout for a completion request, in seconds
+OPENAI_REQUEST_TIMEOUT = float(os.getenv("OPENAI_REQUEST_TIMEOUT", "15"))
+
+# Limit concurrent in-flight completions to stay under the account's rate limits
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+openai_semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+
+# gpt-4o-mini is usually cheaper and faster; set OPENAI_MODEL to switch once measured
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+
+# Sampling parameters shared by the interactive and Batch API paths. The
+# expected JSON needs ~300 tokens, so a tight max_tokens bounds latency
+COMPLETION_PARAMS = {
+    "temperature": 0.7,
+    "max_tokens": 400,
+    "response_format": {"type": "json_object"}
+}
+
+# Bump whenever the prompt template changes so stale cached suggestions are invalidated
+PROMPT_VERSION = "v2"
+
+# Only this much of the resume is sent to the model (to manage token costs)
+RESUME_TEXT_MAX_CHARS = 3000
+
+SYSTEM_PROMPT = (
+    "You are an expert resume reviewer. Always respond with valid JSON only. "
+    "Each suggestion is at most 20 words. Each ATS keyword is a single noun phrase."
+)
+
+PROMPT_TEMPLATE = """You are an expert resume reviewer and career coach. Analyze the following resume{job_context}.
 
 Resume Text:
 {resume_text}
 
 Current Analysis:
 - Score: {score}/100
-- Skills Found: {', '.join(skills) if skills else 'None detected'}
+- Skills Found: {skills_csv}
 - Years of Experience: {years_exp}
 
 Please provide actionable suggestions to improve this resume. Return your response as a JSON object with the following structure:
@@ -73,81 +87,291 @@ Focus on:
 1. Making achievements measurable and quantifiable
 2. Using strong action verbs
 3. Improving ATS compatibility
-4. Highlighting relevant skills{' for ' + job_title if job_title else ''}
+4. Highlighting relevant skills{focus_tail}
 
 Return ONLY the JSON object, no additional text.
 """
+
+# Suggestions cache: small in-process LRU in front of an on-disk cache
+CACHE_DIR = os.path.expanduser(os.getenv("RESUME_ANALYZER_CACHE_DIR", "~/.cache/resume_analyzer"))
+CACHE_EXPIRE_SECONDS = 7 * 86400
+MEMORY_CACHE_SIZE = 256
+
+disk_cache = diskcache.Cache(CACHE_DIR)
+memory_cache: "OrderedDict[str, Dict]" = OrderedDict()
+
+
+def suggestions_cache_key(
+    resume_text: str,
+    score: float,
+    skills: List[str],
+    years_exp: int,
+    job_title: str
+) -> str:
+    """Build a stable cache key for a suggestions request."""
+    payload = json.dumps(
+        [resume_text[:RESUME_TEXT_MAX_CHARS], round(score, 1), sorted(skills), years_exp, job_title, OPENAI_MODEL, PROMPT_VERSION],
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _get_cached_suggestions(key: str) -> Optional[Dict]:
+    """Look up suggestions in the in-process cache, then on disk."""
+    if key in memory_cache:
+        memory_cache.move_to_end(key)
+        return memory_cache[key]
+    
+    cached = disk_cache.get(key)
+    if cached is not None:
+        _remember_suggestions(key, cached)
+    return cached
+
+
+def _remember_suggestions(key: str, suggestions: Dict) -> None:
+    """Store suggestions in the in-process LRU, evicting the oldest entry."""
+    memory_cache[key] = suggestions
+    memory_cache.move_to_end(key)
+    if len(memory_cache) > MEMORY_CACHE_SIZE:
+        memory_cache.popitem(last=False)
+
+
+def store_cached_suggestions(key: str, suggestions: Dict) -> None:
+    """Store suggestions in both cache layers."""
+    _remember_suggestions(key, suggestions)
+    disk_cache.set(key, suggestions, expire=CACHE_EXPIRE_SECONDS)
+
+
+def build_messages(
+    resume_text: str,
+    score: float,
+    skills: List[str],
+    years_exp: int,
+    job_title: str = ""
+) -> List[Dict[str, str]]:
+    """
+    Build the chat messages for a suggestions request.
+    
+    Shared by the interactive and Batch API paths so both send the same prompt.
+    """
+    # Truncate resume text if too long (to manage token costs)
+    if len(resume_text) > RESUME_TEXT_MAX_CHARS:
+        resume_text = resume_text[:RESUME_TEXT_MAX_CHARS] + "...[truncated]"
+    
+    prompt = PROMPT_TEMPLATE.format_map({
+        "job_context": f" for a '{job_title}' position" if job_title else "",
+        "resume_text": resume_text,
+        "score": score,
+        "skills_csv": ", ".join(skills) if skills else "None detected",
+        "years_exp": years_exp,
+        "focus_tail": " for " + job_title if job_title else ""
+    })
+    
+    return [
+        {
+            "role": "system",
+            "content": SYSTEM_PROMPT
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+
+
+def parse_suggestions(content: str) -> Dict:
+    """
+    Parse and normalize the model's JSON response.
+    
+    Raises:
+        json.JSONDecodeError: If the content is not valid JSON
+        ValueError: If the JSON does not have the expected structure
+    """
+    suggestions_data = json.loads(content)
+    
+    # Validate structure
+    if not isinstance(suggestions_data, dict):
+        raise ValueError("response must be a JSON object")
+    if not isinstance(suggestions_data.get("suggestions"), list):
+        raise ValueError("suggestions must be a list")
+    if len(suggestions_data.get("suggestions", [])) != 3:
+        # Pad or trim to exactly 3 suggestions
+        suggestions_data["suggestions"] = (suggestions_data.get("suggestions", []) + ["", "", ""])[:3]
+    
+    if not isinstance(suggestions_data.get("ats_keywords"), list):
+        suggestions_data["ats_keywords"] = []
+    if len(suggestions_data.get("ats_keywords", [])) != 3:
+        suggestions_data["ats_keywords"] = (suggestions_data.get("ats_keywords", []) + ["", "", ""])[:3]
+    
+    if "rewritten_bullet" not in suggestions_data:
+        suggestions_data["rewritten_bullet"] = "No bullet point could be generated."
+    
+    if "title" not in suggestions_data:
+        suggestions_data["title"] = "Professional"
+    
+    return suggestions_data
+
+
+def unparsed_suggestions(content: str) -> Dict:
+    """Fallback structure when the model's response is not valid JSON."""
+    return {
+        "suggestions": [
+            "Unable to parse specific suggestions from AI",
+            "Please review the raw response below",
+            "Consider manual resume review"
+        ],
+        "rewritten_bullet": content[:200] if content else "No response generated",
+        "title": "Professional",
+        "ats_keywords": ["improvement", "needed", "review"],
+        "raw": content
+    }
+
+
+def fallback_suggestions(years_exp: int, job_title: str, error_msg: str) -> Dict:
+    """Static suggestions returned when the OpenAI API call fails."""
+    return {
+        "suggestions": [
+            "Add more quantifiable achievements with specific metrics",
+            "Use strong action verbs to begin each bullet point",
+            f"Highlight relevant skills{' for ' + job_title if job_title else ''}"
+        ],
+        "rewritten_bullet": "Led cross-functional team of 5 to deliver project 2 weeks ahead of schedule, resulting in 15% cost savings",
+        "title": f"{job_title if job_title else 'Professional'} with {years_exp}+ years of experience",
+        "ats_keywords": ["achievement", "leadership", "results"],
+        "error": f"OpenAI API error: {error_msg}"
+    }
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_random_exponential(multiplier=1, max=10),
+    retry=retry_if_exception_type((APITimeoutError, APIConnectionError, RateLimitError)),
+    reraise=True
+)
+async def create_completion(messages: List[Dict[str, str]], **kwargs):
+    """
+    Create a chat completion, retrying transient failures (timeouts,
+    connection errors, rate limits) with jittered exponential backoff.
+    Each attempt is bounded by OPENAI_REQUEST_TIMEOUT.
+    """
+    return await client.chat.completions.create(
+        model=OPENAI_MODEL,
+        messages=messages,
+        timeout=httpx.Timeout(OPENAI_REQUEST_TIMEOUT, connect=5.0),
+        **COMPLETION_PARAMS,
+        **kwargs
+    )
+
+
+async def call_openai_suggestions(
+    resume_text: str,
+    score: float,
+    skills: List[str],
+    years_exp: int,
+    job_title: str = ""
+) -> Dict:
+    """
+    Call OpenAI API to generate resume improvement suggestions.
+    
+    This is a coroutine so several resumes can be analyzed concurrently, e.g.
+    ``await asyncio.gather(*[call_openai_suggestions(...) for r in resumes])``.
+    
+    Args:
+        resume_text: Full text of the resume
+        score: Calculated resume score
+        skills: List of detected skills
+        years_exp: Estimated years of experience
+        job_title: Optional target job title
+        
+    Returns:
+        Dictionary with keys: suggestions (list), rewritten_bullet (str),
+        title (str), ats_keywords (list)
+    """
+    # Return cached suggestions for identical requests
+    cache_key = suggestions_cache_key(resume_text, score, skills, years_exp, job_title)
+    cached = _get_cached_suggestions(cache_key)
+    if cached is not None:
+        return cached
+    
+    messages = build_messages(resume_text, score, skills, years_exp, job_title)
     
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert resume reviewer. Always respond with valid JSON only."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.7,
-            max_tokens=800
-        )
+        async with openai_semaphore:
+            response = await create_completion(messages)
         
         # Extract the response content
         content = response.choices[0].message.content.strip()
         
         # Try to parse as JSON
         try:
-            suggestions_data = json.loads(content)
-            
-            # Validate structure
-            if not isinstance(suggestions_data.get("suggestions"), list):
-                raise ValueError("suggestions must be a list")
-            if len(suggestions_data.get("suggestions", [])) != 3:
-                # Pad or trim to exactly 3 suggestions
-                suggestions_data["suggestions"] = (suggestions_data.get("suggestions", []) + ["", "", ""])[:3]
-            
-            if not isinstance(suggestions_data.get("ats_keywords"), list):
-                suggestions_data["ats_keywords"] = []
-            if len(suggestions_data.get("ats_keywords", [])) != 3:
-                suggestions_data["ats_keywords"] = (suggestions_data.get("ats_keywords", []) + ["", "", ""])[:3]
-            
-            if "rewritten_bullet" not in suggestions_data:
-                suggestions_data["rewritten_bullet"] = "No bullet point could be generated."
-            
-            if "title" not in suggestions_data:
-                suggestions_data["title"] = "Professional"
-            
-            return suggestions_data
-            
+            suggestions_data = parse_suggestions(content)
         except json.JSONDecodeError:
-            # If JSON parsing fails, return the raw content with fallback structure
-            return {
-                "suggestions": [
-                    "Unable to parse specific suggestions from AI",
-                    "Please review the raw response below",
-                    "Consider manual resume review"
-                ],
-                "rewritten_bullet": content[:200] if content else "No response generated",
-                "title": "Professional",
-                "ats_keywords": ["improvement", "needed", "review"],
-                "raw": content
-            }
+            # JSON mode guarantees valid JSON unless the reply is cut off at max_tokens;
+            # in that case return the raw content with fallback structure
+            return unparsed_suggestions(content)
+        
+        # Only well-formed responses are cached; fallbacks are retried next time
+        store_cached_suggestions(cache_key, suggestions_data)
+        
+        return suggestions_data
     
     except Exception as e:
         # Return fallback suggestions if API call fails
-        error_msg = str(e)
-        
-        return {
-            "suggestions": [
-                "Add more quantifiable achievements with specific metrics",
-                "Use strong action verbs to begin each bullet point",
-                f"Highlight relevant skills{' for ' + job_title if job_title else ''}"
-            ],
-            "rewritten_bullet": "Led cross-functional team of 5 to deliver project 2 weeks ahead of schedule, resulting in 15% cost savings",
-            "title": f"{job_title if job_title else 'Professional'} with {years_exp}+ years of experience",
-            "ats_keywords": ["achievement", "leadership", "results"],
-            "error": f"OpenAI API error: {error_msg}"
-        }
+        return fallback_suggestions(years_exp, job_title, str(e))
+
+
+async def call_openai_suggestions_stream(
+    resume_text: str,
+    score: float,
+    skills: List[str],
+    years_exp: int,
+    job_title: str = ""
+) -> AsyncIterator[Dict]:
+    """
+    Streaming variant of call_openai_suggestions.
+    
+    Yields {"type": "token", "content": str} events as the model generates them,
+    followed by a single {"type": "result", "suggestions": dict} event once the
+    accumulated response has been parsed. Cache hits and API errors yield only
+    the result event.
+    """
+    cache_key = suggestions_cache_key(resume_text, score, skills, years_exp, job_title)
+    cached = _get_cached_suggestions(cache_key)
+    if cached is not None:
+        yield {"type": "result", "suggestions": cached}
+        return
+    
+    messages = build_messages(resume_text, score, skills, years_exp, job_title)
+    chunks = []
+    
+    try:
+        # The semaphore only guards opening the request; holding it while a
+        # slow client reads tokens would starve other requests of slots
+        async with openai_semaphore:
+            stream = await create_completion(messages, stream=True)
+        # Closes the HTTP response even if the consumer stops early
+        async with stream:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                token = chunk.choices[0].delta.content or ""
+                if token:
+                    chunks.append(token)
+                    yield {"type": "token", "content": token}
+    except Exception as e:
+        yield {"type": "result", "suggestions": fallback_suggestions(years_exp, job_title, str(e))}
+        return
+    
+    content = "".join(chunks).strip()
+    # The SSE response has already started, so anything raised here would
+    # truncate the stream without a final result event
+    try:
+        suggestions_data = parse_suggestions(content)
+    except json.JSONDecodeError:
+        suggestions_data = unparsed_suggestions(content)
+    except Exception as e:
+        suggestions_data = fallback_suggestions(years_exp, job_title, str(e))
+    else:
+        store_cached_suggestions(cache_key, suggestions_data)
+    
+    yield {"type": "result", "suggestions": suggestions_data}